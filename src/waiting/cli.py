@@ -1,9 +1,11 @@
 """CLI interface for waiting - hook-based notification setup."""
 
+import copy
 import json
 import os
+import signal
 import stat
-import sys
+import time
 from pathlib import Path
 
 import click
@@ -16,6 +18,30 @@ DEFAULT_CONFIG = {
     "grace_period": 60,
 }
 
+# Runtime state shared with the hook scripts
+PID_FILE = Path("/tmp/waiting-nag.pid")
+ACTIVITY_FILE = Path("/tmp/waiting-last-activity")
+
+# Stop hook script (static, so it is built once at import)
+STOP_SCRIPT = """#!/bin/bash
+# Stop the waiting nag loop and record user activity
+PID_FILE="/tmp/waiting-nag.pid"
+ACTIVITY_FILE="/tmp/waiting-last-activity"
+
+# Record that user was just active (bash 5+ has EPOCHSECONDS, avoiding a fork)
+echo "${EPOCHSECONDS:-$(date +%s)}" > "$ACTIVITY_FILE"
+
+# Kill the nag loop if running
+if [ -f "$PID_FILE" ]; then
+    read -r pid 2>/dev/null < "$PID_FILE"
+    if [ -n "$pid" ]; then
+        kill "$pid" 2>/dev/null
+        pkill -P "$pid" 2>/dev/null
+    fi
+    rm -f "$PID_FILE"
+fi
+"""
+
 
 def get_config_path() -> Path:
     """Get the waiting config file path.
@@ -32,10 +58,10 @@ def load_config() -> dict:
     config_path = get_config_path()
     config = DEFAULT_CONFIG.copy()
 
-    if config_path.exists():
-        with open(config_path) as f:
-            user_config = json.load(f)
-            config.update(user_config)
+    try:
+        config.update(json.loads(config_path.read_bytes()))
+    except FileNotFoundError:
+        pass
 
     return config
 
@@ -45,8 +71,7 @@ def save_config(config: dict) -> None:
     config_path = get_config_path()
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(config_path, "w") as f:
-        json.dump(config, f, indent=2)
+    config_path.write_text(json.dumps(config, indent=2))
 
 
 def get_default_audio() -> str:
@@ -71,17 +96,37 @@ def load_claude_settings() -> dict:
     settings_path = get_claude_settings_path()
     settings_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if settings_path.exists():
-        with open(settings_path) as f:
-            return json.load(f)
-    return {}
+    try:
+        return json.loads(settings_path.read_bytes())
+    except FileNotFoundError:
+        return {}
 
 
 def save_claude_settings(settings: dict) -> None:
     """Save Claude Code settings."""
     settings_path = get_claude_settings_path()
-    with open(settings_path, "w") as f:
-        json.dump(settings, f, indent=2)
+    settings_path.write_text(json.dumps(settings, indent=2))
+
+
+def _write_executable(path: Path, content: str) -> None:
+    """Write a hook script and make it executable.
+
+    An identical, already-executable script is left untouched. Otherwise
+    the mode is read and set through the open descriptor, so the path is
+    only looked up once.
+    """
+    exec_bits = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
+    try:
+        if path.read_bytes() == content.encode() and path.stat().st_mode & exec_bits == exec_bits:
+            return
+    except FileNotFoundError:
+        pass
+
+    with open(path, "w") as f:
+        f.write(content)
+        fd = f.fileno()
+        os.fchmod(fd, os.fstat(fd).st_mode | exec_bits)
 
 
 def create_notify_script(audio_path: str, interval: int = 30, max_nags: int = 0, grace_period: int = 60) -> Path:
@@ -93,7 +138,8 @@ def create_notify_script(audio_path: str, interval: int = 30, max_nags: int = 0,
         max_nags: Maximum number of repeats (0 = unlimited)
         grace_period: Seconds after user activity to suppress notifications (0 = no grace)
     """
-    script_path = get_hooks_dir() / "waiting-notify.sh"
+    hooks_dir = get_hooks_dir()
+    script_path = hooks_dir / "waiting-notify.sh"
 
     script_content = f"""#!/bin/bash
 # Waiting - Nag user until they respond to Claude Code
@@ -108,8 +154,9 @@ GRACE_PERIOD={grace_period}
 # Check if user was recently active (within grace period)
 SKIP_IMMEDIATE=0
 if [ "$GRACE_PERIOD" -gt 0 ] && [ -f "$ACTIVITY_FILE" ]; then
-    last_activity=$(cat "$ACTIVITY_FILE" 2>/dev/null || echo 0)
-    now=$(date +%s)
+    read -r last_activity 2>/dev/null < "$ACTIVITY_FILE"
+    last_activity=${{last_activity:-0}}
+    now=${{EPOCHSECONDS:-$(date +%s)}}
     elapsed=$((now - last_activity))
     if [ "$elapsed" -lt "$GRACE_PERIOD" ]; then
         # User was active recently, skip immediate sound but still start nag loop
@@ -119,7 +166,7 @@ fi
 
 # Kill any existing nag process
 if [ -f "$PID_FILE" ]; then
-    old_pid=$(cat "$PID_FILE" 2>/dev/null)
+    read -r old_pid 2>/dev/null < "$PID_FILE"
     if [ -n "$old_pid" ]; then
         kill "$old_pid" 2>/dev/null
         pkill -P "$old_pid" 2>/dev/null
@@ -127,24 +174,24 @@ if [ -f "$PID_FILE" ]; then
     rm -f "$PID_FILE"
 fi
 
-play_sound() {{
-    if command -v aplay &> /dev/null; then
-        aplay -q "{audio_path}" 2>/dev/null
-    elif command -v paplay &> /dev/null; then
-        paplay "{audio_path}" 2>/dev/null
-    elif command -v pw-play &> /dev/null; then
-        pw-play "{audio_path}" 2>/dev/null
-    elif command -v afplay &> /dev/null; then
-        afplay "{audio_path}" 2>/dev/null
-    elif command -v powershell.exe &> /dev/null; then
-        win_path=$(wslpath -w "{audio_path}" 2>/dev/null)
-        if [ -n "$win_path" ]; then
-            powershell.exe -c "(New-Object Media.SoundPlayer '$win_path').PlaySync()" 2>/dev/null
-        else
-            powershell.exe -c "(New-Object Media.SoundPlayer 'C:\\Windows\\Media\\notify.wav').PlaySync()" 2>/dev/null
-        fi
+# Pick the audio player once, rather than probing again on every nag
+if command -v aplay &> /dev/null; then
+    play_sound() {{ aplay -q "{audio_path}" 2>/dev/null; }}
+elif command -v paplay &> /dev/null; then
+    play_sound() {{ paplay "{audio_path}" 2>/dev/null; }}
+elif command -v pw-play &> /dev/null; then
+    play_sound() {{ pw-play "{audio_path}" 2>/dev/null; }}
+elif command -v afplay &> /dev/null; then
+    play_sound() {{ afplay "{audio_path}" 2>/dev/null; }}
+elif command -v powershell.exe &> /dev/null; then
+    win_path=$(wslpath -w "{audio_path}" 2>/dev/null)
+    if [ -z "$win_path" ]; then
+        win_path='C:\\Windows\\Media\\notify.wav'
     fi
-}}
+    play_sound() {{ powershell.exe -c "(New-Object Media.SoundPlayer '$win_path').PlaySync()" 2>/dev/null; }}
+else
+    play_sound() {{ :; }}
+fi
 
 # Play immediately (unless within grace period)
 if [ "$SKIP_IMMEDIATE" -eq 0 ]; then
@@ -173,35 +220,11 @@ fi
 echo $! > "$PID_FILE"
 """
 
-    with open(script_path, "w") as f:
-        f.write(script_content)
-
-    # Make executable
-    script_path.chmod(script_path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    _write_executable(script_path, script_content)
 
     # Create stop script (kills the nag loop and records activity)
-    stop_script_path = get_hooks_dir() / "waiting-stop.sh"
-    stop_content = """#!/bin/bash
-# Stop the waiting nag loop and record user activity
-PID_FILE="/tmp/waiting-nag.pid"
-ACTIVITY_FILE="/tmp/waiting-last-activity"
-
-# Record that user was just active
-date +%s > "$ACTIVITY_FILE"
-
-# Kill the nag loop if running
-if [ -f "$PID_FILE" ]; then
-    pid=$(cat "$PID_FILE" 2>/dev/null)
-    if [ -n "$pid" ]; then
-        kill "$pid" 2>/dev/null
-        pkill -P "$pid" 2>/dev/null
-    fi
-    rm -f "$PID_FILE"
-fi
-"""
-    with open(stop_script_path, "w") as f:
-        f.write(stop_content)
-    stop_script_path.chmod(stop_script_path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    stop_script_path = hooks_dir / "waiting-stop.sh"
+    _write_executable(stop_script_path, STOP_SCRIPT)
 
     return script_path
 
@@ -218,6 +241,7 @@ def _is_waiting_hook(hook_config: dict) -> bool:
 def setup_hook(script_path: Path) -> None:
     """Add notification hooks to Claude settings for immediate alerts."""
     settings = load_claude_settings()
+    original = copy.deepcopy(settings)
     stop_script = script_path.parent / "waiting-stop.sh"
 
     if "hooks" not in settings:
@@ -282,12 +306,15 @@ def setup_hook(script_path: Path) -> None:
         if not settings["hooks"]["Notification"]:
             del settings["hooks"]["Notification"]
 
-    save_claude_settings(settings)
+    # Re-running with identical hooks is common; skip rewriting settings.json
+    if settings != original:
+        save_claude_settings(settings)
 
 
 def remove_hook() -> None:
     """Remove all waiting hooks from Claude settings."""
     settings = load_claude_settings()
+    original = copy.deepcopy(settings)
 
     if "hooks" not in settings:
         return
@@ -306,7 +333,8 @@ def remove_hook() -> None:
     if not settings["hooks"]:
         del settings["hooks"]
 
-    save_claude_settings(settings)
+    if settings != original:
+        save_claude_settings(settings)
 
 
 @click.group(invoke_without_command=True)
@@ -377,10 +405,9 @@ def disable():
     remove_hook()
 
     # Remove scripts
+    hooks_dir = get_hooks_dir()
     for script_name in ["waiting-notify.sh", "waiting-stop.sh"]:
-        script_path = get_hooks_dir() / script_name
-        if script_path.exists():
-            script_path.unlink()
+        (hooks_dir / script_name).unlink(missing_ok=True)
 
     # Kill any running nag process
     _kill_nag_process()
@@ -400,26 +427,20 @@ def kill():
 
 def _kill_nag_process() -> bool:
     """Kill any running nag process. Returns True if a process was killed."""
-    import signal
-
-    pid_file = Path("/tmp/waiting-nag.pid")
-    activity_file = Path("/tmp/waiting-last-activity")
     killed = False
 
-    if pid_file.exists():
-        try:
-            pid = int(pid_file.read_text().strip())
-            # Kill the process and its children
-            os.kill(pid, signal.SIGTERM)
-            killed = True
-        except (ValueError, ProcessLookupError, PermissionError):
-            pass  # Process already dead or invalid PID
-        pid_file.unlink(missing_ok=True)
+    try:
+        pid = int(PID_FILE.read_text().strip())
+        # Kill the process and its children
+        os.kill(pid, signal.SIGTERM)
+        killed = True
+    except (FileNotFoundError, ValueError, ProcessLookupError, PermissionError):
+        pass  # No nag loop started, process already dead, or invalid PID
+    PID_FILE.unlink(missing_ok=True)
 
     # Also record activity so grace period kicks in
-    if activity_file.exists() or killed:
-        import time
-        activity_file.write_text(str(int(time.time())))
+    if ACTIVITY_FILE.exists() or killed:
+        ACTIVITY_FILE.write_text(str(int(time.time())))
 
     return killed
 
@@ -431,13 +452,8 @@ def status():
     script_path = get_hooks_dir() / "waiting-notify.sh"
 
     # Check if PermissionRequest hook is configured
-    hook_found = False
-    if "hooks" in settings:
-        if "PermissionRequest" in settings["hooks"]:
-            for h in settings["hooks"]["PermissionRequest"]:
-                if _is_waiting_hook(h):
-                    hook_found = True
-                    break
+    permission_hooks = settings.get("hooks", {}).get("PermissionRequest", [])
+    hook_found = any(_is_waiting_hook(h) for h in permission_hooks)
 
     if hook_found and script_path.exists():
         click.echo("Status: ENABLED")
@@ -458,6 +474,9 @@ def status():
                     max_nags = line.split("=", 1)[1].strip()
                 elif line.startswith("GRACE_PERIOD="):
                     grace_period = line.split("=", 1)[1].strip()
+                # Settings live in the script header; skip the rest once all are found
+                if None not in (audio, interval, max_nags, grace_period):
+                    break
 
         if audio:
             click.echo(f"  Audio: {audio}")
@@ -469,8 +488,7 @@ def status():
             click.echo(f"  Max nags: {'unlimited' if max_nags == '0' else max_nags}")
 
         # Check if currently nagging
-        pid_file = Path("/tmp/waiting-nag.pid")
-        if pid_file.exists():
+        if PID_FILE.exists():
             click.echo(f"  Currently: NAGGING (pid file exists)")
     else:
         click.echo("Status: DISABLED")